@@ -1,13 +1,30 @@
-"""Models package exports"""
+"""Models package exports
 
-from src.models.device import (
-    Device,
-    DeviceCreate,
-    DevicePlatform,
-    DeviceRole,
-    DeviceUpdate,
-)
+Exports are resolved lazily through a module-level __getattr__ (PEP 562),
+so importing the package doesn't import pydantic until a model is used.
+"""
 
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.models.device import (
+        Device,
+        DeviceCreate,
+        DevicePlatform,
+        DeviceRole,
+        DeviceUpdate,
+    )
+
+
+# Exported name -> module that defines it
+_EXPORTS = {
+    "Device": "src.models.device",
+    "DeviceCreate": "src.models.device",
+    "DeviceUpdate": "src.models.device",
+    "DevicePlatform": "src.models.device",
+    "DeviceRole": "src.models.device",
+}
 
 __all__ = [
     "Device",
@@ -16,3 +33,17 @@ __all__ = [
     "DevicePlatform",
     "DeviceRole",
 ]
+
+
+def __getattr__(name: str):
+    """Import the defining module on first access and cache the result."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
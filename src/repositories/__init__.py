@@ -1,12 +1,43 @@
-"""Repository layer exports."""
+"""Repository layer exports.
 
-from src.repositories.base import DeviceRepository
-from src.repositories.exceptions import DeviceNotFoundError, DuplicateDeviceError
-from src.repositories.memory import InMemoryDeviceRepository
+Exports are resolved lazily through a module-level __getattr__ (PEP 562),
+so importing the package doesn't import the models until they're used.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.repositories.base import DeviceRepository
+    from src.repositories.exceptions import DeviceNotFoundError, DuplicateDeviceError
+    from src.repositories.memory import InMemoryDeviceRepository
+
+
+# Exported name -> module that defines it
+_EXPORTS = {
+    "DeviceRepository": "src.repositories.base",
+    "InMemoryDeviceRepository": "src.repositories.memory",
+    "DuplicateDeviceError": "src.repositories.exceptions",
+    "DeviceNotFoundError": "src.repositories.exceptions",
+}
 
 __all__ = [
     "DeviceRepository",
     "InMemoryDeviceRepository",
     "DuplicateDeviceError",
     "DeviceNotFoundError",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    """Import the defining module on first access and cache the result."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
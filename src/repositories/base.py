@@ -1,28 +1,34 @@
 """
 Repository interface definitions.
 
-This module defines the abstract base class that all repository
+This module defines the protocol that all repository
 implementations must follow. This is the "contract" that the rest
 of the application depends on.
 
-Why an abstract base class?
+Why a Protocol?
 1. Documents the expected interface clearly
-2. Enforces implementation of all required methods
-3. Allows type hints to reference the base class
+2. Type checkers verify implementations structurally, no inheritance needed
+3. Allows type hints to reference the interface
 4. Makes it easy to swap implementations (memory, JSON, database)
+5. No ABCMeta metaclass on the implementations, so there is no
+   abstract-method bookkeeping at class creation or instantiation
 """
 
-from abc import ABC, abstractmethod
-from typing import Optional
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Protocol, runtime_checkable
 from uuid import UUID
 
 from src.models.device import Device, DeviceCreate, DeviceUpdate
 
-class DeviceRepository(ABC):
+@runtime_checkable
+class DeviceRepository(Protocol):
     """
-    Abstract base class for device storage operations.
+    Protocol for device storage operations.
 
     All repository implementations must provide these methods.
+    Implementations don't subclass this; any class with matching
+    methods satisfies it. The protocol is runtime checkable, so
+    isinstance(repo, DeviceRepository) confirms every method is present.
     The service layer depends only on this interface, not on
     concrete implementations.
 
@@ -30,7 +36,6 @@ class DeviceRepository(ABC):
     "Depend on abstractions, not concretions."
     """
 
-    @abstractmethod
     def add(self, device_data: DeviceCreate) -> Device:
         """
         Add a new device to the repository.
@@ -44,9 +49,24 @@ class DeviceRepository(ABC):
         Raises:
              DuplicateDeviceError: If hostname or IP already exists
         """
-        pass
+        ...
+
+    def bulk_add(self, devices_data: Iterable[DeviceCreate]) -> list[Device]:
+        """
+        Add several devices at once.
+
+        Args:
+            devices_data: Validated device creation data
+
+        Returns:
+            The created Devices, in input order
+
+        Raises:
+             DuplicateDeviceError: If a hostname or IP already exists or
+                 repeats within the batch; no device is added in that case
+        """
+        ...
 
-    @abstractmethod
     def get_by_id(self, device_id: UUID) -> Optional[Device]:
         """
         Retrieve a device by its unique identifier
@@ -57,9 +77,8 @@ class DeviceRepository(ABC):
         Returns:
               The Device if found, None otherwise
         """
-        pass
+        ...
 
-    @abstractmethod
     def get_by_hostname(self, hostname: str) -> Optional[Device]:
         """
         Retrieve a device by its hostname
@@ -70,33 +89,58 @@ class DeviceRepository(ABC):
         Returns:
               The Device if found, None otherwise
         """
-        pass
+        ...
+
+    def iter_all(self) -> Iterator[Device]:
+        """
+        Iterate over all devices in the repository without copying them.
+
+        Don't add, update or delete devices while the iterator is
+        being consumed.
+
+        Returns:
+            Iterator over all devices
+        """
+        ...
 
-    @abstractmethod
     def get_all(self) -> list[Device]:
         """
         Retrieve all devices in the repository
 
+        Each call returns a new list, which the caller may modify.
+
         Returns:
             List of all devices, empty list if none exist.
         """
-        pass
-
-    @abstractmethod
-    def update(self, device_id: UUID, update_data: DeviceUpdate) -> Optional[Device]:
+        ...
+
+    def update(
+        self,
+        device_id: UUID,
+        update_data: DeviceUpdate,
+        *,
+        now: Optional[datetime] = None,
+    ) -> Optional[Device]:
         """
         Update an existing device
 
         Args:
             device_id: The UUID of the device to update
             update_data:: Fields to update (None values are ignored)
+            now: Timestamp to store as updated_at; defaults to the current
+                time. Lets a caller applying many updates read the clock once.
+                Must be a naive local datetime, like Device's defaults.
 
         Returns:
               The updated Device if found, None if device doesn't exist
+
+        Raises:
+             DuplicateDeviceError: If the new hostname or IP already exists
+             TypeError: If now is not a datetime
+             ValueError: If now is timezone-aware
         """
-        pass
+        ...
 
-    @abstractmethod
     def delete(self, device_id: UUID) -> bool:
         """
         Remove a device from the repository.
@@ -107,9 +151,8 @@ class DeviceRepository(ABC):
         Returns:
               True if device was deleted, False if not found
         """
-        pass
+        ...
 
-    @abstractmethod
     def filter_by(
     self,
     platform: Optional[str] = None,
@@ -127,4 +170,4 @@ class DeviceRepository(ABC):
         Returns:
               List of devices matching all provided criteria
         """
-        pass
\ No newline at end of file
+        ...
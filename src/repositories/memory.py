@@ -9,21 +9,31 @@ This implementation stores devices in a dictionary. It's useful for:
 Data is lost when the process exits.
 """
 
+from collections import defaultdict
 from datetime import datetime
-from typing import Optional
+from itertools import count
+from typing import Collection, Iterable, Iterator, Optional
 from uuid import UUID
 
-from src.models.device import Device, DeviceCreate, DeviceUpdate
-from src.repositories.base import DeviceRepository
+from src.models.device import (
+    Device,
+    DeviceCreate,
+    DevicePlatform,
+    DeviceRole,
+    DeviceUpdate,
+)
 from src.repositories.exceptions import DuplicateDeviceError
 
 
-class InMemoryDeviceRepository(DeviceRepository):
+class InMemoryDeviceRepository:
     """
     Dictionary-based device repository.
 
+    Satisfies the DeviceRepository protocol structurally.
+
     Devices are stored in a dict keyed by UUID. We also maintain
-    secondary indexes for hostname and IP lookups.
+    secondary indexes for hostname and IP lookups, and for the
+    platform, role and site columns that filter_by queries.
 
     Thread Safety: This implementation is NOT thread-safe.
     For concurrent access, you'd need locks or a thread-sade dict.
@@ -32,9 +42,22 @@ class InMemoryDeviceRepository(DeviceRepository):
     def __init__(self):
         """Initialize empty storage."""
         self._devices: dict[UUID, Device] = {}
-        # Secondary indexes for dast lookups
-        self._hostname_index: dict[str, UUID] = {}
-        self._ip_index: dict[str, UUID] ={}
+        # Secondary indexes for fast lookups. They hold the Device itself
+        # (a reference, not a copy), so a lookup is a single dict access.
+        self._hostname_index: dict[str, Device] = {}
+        # Keyed by the packed address (4 bytes for IPv4, 16 for IPv6).
+        # The length keeps the two families apart, and nothing is
+        # formatted to text on the hot path.
+        self._ip_index: dict[bytes, Device] = {}
+        # Non-unique indexes: each value maps to the ids that have it
+        self._by_platform: dict[DevicePlatform, set[UUID]] = defaultdict(set)
+        self._by_role: dict[DeviceRole, set[UUID]] = defaultdict(set)
+        self._by_site: dict[str, set[UUID]] = defaultdict(set)
+        # Insertion position of each id. The attribute index sets are
+        # unordered, so filter_by sorts its matches by this to return them
+        # in the same order as get_all().
+        self._order: dict[UUID, int] = {}
+        self._next_order = count()
 
     def add(self, device_data: DeviceCreate) -> Device:
         """
@@ -50,59 +73,150 @@ class InMemoryDeviceRepository(DeviceRepository):
             raise DuplicateDeviceError("hostname", device_data.hostname)
 
         # Check for duplicate IP
-        ip_str = str(device_data.management_ip)
-        if ip_str in self._ip_index:
-            raise DuplicateDeviceError("management_ip", ip_str)
-
-        # Create the full Device from the create schema
-        device = Device (
+        ip_key = device_data.management_ip.packed
+        if ip_key in self._ip_index:
+            raise DuplicateDeviceError("management_ip", str(device_data.management_ip))
+
+        # Create the full Device from the create schema.
+        # DeviceCreate has already validated every field, so we use
+        # model_construct to skip running the same validators twice.
+        # The id comes from the field's default_factory.
+        now = datetime.now()
+        device = Device.model_construct(
             hostname=device_data.hostname,
             management_ip=device_data.management_ip,
             platform=device_data.platform,
             role=device_data.role,
             site=device_data.site,
+            created_at=now,
+            updated_at=now,
         )
 
         # Store in primary and secondary indexes
         self._devices[device.id] = device
-        self._hostname_index[device.hostname] = device.id
-        self._ip_index[str(device.management_ip)] = device.id
+        self._order[device.id] = next(self._next_order)
+        self._hostname_index[device.hostname] = device
+        self._ip_index[ip_key] = device
+        self._by_platform[device.platform].add(device.id)
+        self._by_role[device.role].add(device.id)
+        self._by_site[device.site].add(device.id)
 
         return device
 
+    def bulk_add(self, devices_data: Iterable[DeviceCreate]) -> list[Device]:
+        """
+        Add many devices in one call.
+
+        Every item is checked against the stored devices and against the
+        earlier items of the same batch before anything is stored, so a
+        duplicate raises and leaves the repository unchanged. The whole
+        batch shares one timestamp.
+        """
+        now = datetime.now()
+        batch_hostnames: set[str] = set()
+        batch_ips: set[bytes] = set()
+        # (packed IP, device) pairs, so the commit loop reuses each IP key
+        # computed by the checks instead of packing the address again
+        entries: list[tuple[bytes, Device]] = []
+
+        for device_data in devices_data:
+            hostname = device_data.hostname
+            if hostname in self._hostname_index or hostname in batch_hostnames:
+                raise DuplicateDeviceError("hostname", hostname)
+
+            ip = device_data.management_ip.packed
+            if ip in self._ip_index or ip in batch_ips:
+                raise DuplicateDeviceError("management_ip", str(device_data.management_ip))
+
+            batch_hostnames.add(hostname)
+            batch_ips.add(ip)
+
+            # Already validated by DeviceCreate, same as in add()
+            device = Device.model_construct(
+                hostname=hostname,
+                management_ip=device_data.management_ip,
+                platform=device_data.platform,
+                role=device_data.role,
+                site=device_data.site,
+                created_at=now,
+                updated_at=now,
+            )
+            entries.append((ip, device))
+
+        # Every check passed; store in primary and secondary indexes
+        for ip, device in entries:
+            self._devices[device.id] = device
+            self._order[device.id] = next(self._next_order)
+            self._hostname_index[device.hostname] = device
+            self._ip_index[ip] = device
+            self._by_platform[device.platform].add(device.id)
+            self._by_role[device.role].add(device.id)
+            self._by_site[device.site].add(device.id)
+
+        return [device for _, device in entries]
+
     def get_by_id(self, device_id: UUID) -> Optional[Device]:
         """Direct dictionary lookup by UUID."""
         return self._devices.get(device_id)
 
     def get_by_hostname(self, hostname: str) -> Optional[Device]:
         """
-        Two-step lookup: hostname -> UUID -> Device.
+        Direct lookup in the hostname index, which stores the Device.
 
         This is O(1) thanks to the secondary index.
         """
-        device_id = self._hostname_index.get(hostname)
-        if device_id is None:
-            return None
-        return self._devices.get(device_id)
+        return self._hostname_index.get(hostname)
+
+    def iter_all(self) -> Iterator[Device]:
+        """Iterate over the stored devices directly, without building a list."""
+        return iter(self._devices.values())
 
     def get_all(self) -> list[Device]:
-        """Return all devices as a list."""
+        """Return all devices as a new list."""
         return list(self._devices.values())
 
-    def update(self, device_id: UUID, update_data: DeviceUpdate) -> Optional[Device]:
+    def update(
+        self,
+        device_id: UUID,
+        update_data: DeviceUpdate,
+        *,
+        now: Optional[datetime] = None,
+    ) -> Optional[Device]:
         """
         Update a device with partial data.
 
         Because Device is immutable (frozen), we create a new instance
         with the updated fields. This is the safe pattern for immutable data.
+
+        The clock is only read when `now` isn't given and the patch sets
+        at least one field to a non-None value, even if that value equals
+        the stored one. A given `now` must be a naive local datetime, like
+        Device's own defaults, so it stays comparable with created_at.
         """
+        if now is not None:
+            if not isinstance(now, datetime):
+                raise TypeError(f"now must be a datetime, not {type(now).__name__}")
+            if now.tzinfo is not None:
+                raise ValueError("now must be a naive local datetime, like created_at")
+
         existing = self._devices.get(device_id)
         if existing is None:
             return None
 
+        # An empty patch needs no dict building at all
+        fields_set = update_data.__pydantic_fields_set__
+        if not fields_set:
+            return existing
+
         # Get non-None fields from update_data
-        # model_dump(exclude_unset=True) returns only explicitly set fields
-        updates = update_data.model_dump(exclude_unset=True)
+        # __pydantic_fields_set__ holds only the explicitly set fields, so
+        # we read those attributes directly instead of paying for a
+        # model_dump(exclude_unset=True) serializer call
+        updates = {
+            name: value
+            for name in fields_set
+            if (value := getattr(update_data, name)) is not None
+        }
 
         if not updates:
             return existing  # Nothing to update
@@ -112,27 +226,49 @@ class InMemoryDeviceRepository(DeviceRepository):
             if updates["hostname"] in self._hostname_index:
                 raise DuplicateDeviceError("hostname", updates["hostname"])
 
-        # Check for duplicate IP if it's being changed
+        # Check for duplicate IP if it's being changed. Both index keys
+        # are packed once here and reused when the index is updated.
+        old_ip = existing.management_ip.packed
+        new_ip = old_ip
         if "management_ip" in updates:
-            new_ip = str(updates["management_ip"])
-            if new_ip != str(existing.management_ip) and new_ip in self._ip_index:
-                raise DuplicateDeviceError("management_ip", new_ip)
+            new_ip = updates["management_ip"].packed
+            if new_ip != old_ip and new_ip in self._ip_index:
+                raise DuplicateDeviceError("management_ip", str(updates["management_ip"]))
 
         # Add updated_at timestamp
-        updates["updated_at"] = datetime.now()
+        updates["updated_at"] = now if now is not None else datetime.now()
 
         # Create new device with updates
-        # model_copy creates a copy with specified field changes
+        # model_copy creates a copy with specified field changes. It does
+        # not re-run validation (the values come from a validated
+        # DeviceUpdate), and copying __dict__ is cheaper than model_construct.
         updated_device = existing.model_copy(update=updates)
 
-        # Update indexes if hostname or IP changed
-        if updated_device.hostname != existing.hostname:
-            del self._hostname_index[existing.hostname]
-            self._hostname_index[updated_device.hostname] = device_id
+        # The hostname and IP indexes hold the Device itself, so they
+        # always point at the new instance. Everything else is only
+        # touched when the patch set that field to a new value, so an
+        # update that changes nothing indexed moves no keys.
+        # New entries are written before stale ones are removed, so the
+        # device stays reachable through every index at each step.
+        self._hostname_index[updated_device.hostname] = updated_device
+        if "hostname" in updates and updated_device.hostname != existing.hostname:
+            self._hostname_index.pop(existing.hostname, None)
 
-        if str(updated_device.management_ip) != str(existing.management_ip):
-            del self._ip_index[str(existing.management_ip)]
-            self._ip_index[str(updated_device.management_ip)] = device_id
+        self._ip_index[new_ip] = updated_device
+        if new_ip != old_ip:
+            self._ip_index.pop(old_ip, None)
+
+        if "platform" in updates and updated_device.platform is not existing.platform:
+            self._by_platform[updated_device.platform].add(device_id)
+            self._discard(self._by_platform, existing.platform, device_id)
+
+        if "role" in updates and updated_device.role is not existing.role:
+            self._by_role[updated_device.role].add(device_id)
+            self._discard(self._by_role, existing.role, device_id)
+
+        if "site" in updates and updated_device.site != existing.site:
+            self._by_site[updated_device.site].add(device_id)
+            self._discard(self._by_site, existing.site, device_id)
 
         # Store updated device
         self._devices[device_id] = updated_device
@@ -145,17 +281,44 @@ class InMemoryDeviceRepository(DeviceRepository):
 
         Returns True if deleted, False if device didn't exist.
         """
-        device = self._devices.get(device_id)
+        # pop() finds and removes the device in one lookup
+        device = self._devices.pop(device_id, None)
         if device is None:
             return False
 
-        # Remove from all indexes
-        del self._devices[device_id]
-        del self._hostname_index[device.hostname]
-        del self._ip_index[str(device.management_ip)]
+        # Remove from the secondary indexes using the removed record
+        self._hostname_index.pop(device.hostname, None)
+        self._ip_index.pop(device.management_ip.packed, None)
+        self._order.pop(device_id, None)
+        self._discard(self._by_platform, device.platform, device_id)
+        self._discard(self._by_role, device.role, device_id)
+        self._discard(self._by_site, device.site, device_id)
 
         return True
 
+    @staticmethod
+    def _discard(index: dict, key: object, device_id: UUID) -> None:
+        """Remove an id from an attribute index, dropping the bucket once empty."""
+        bucket = index[key]
+        bucket.discard(device_id)
+        if not bucket:
+            del index[key]
+
+    def _in_insertion_order(self, device_ids: Collection[UUID]) -> list[Device]:
+        """Return the devices for a set of ids in the order they were added."""
+        # When most devices match, one pass over the insertion-ordered
+        # primary dict is cheaper than sorting the matches
+        if 2 * len(device_ids) >= len(self._devices):
+            return [
+                device
+                for device_id, device in self._devices.items()
+                if device_id in device_ids
+            ]
+        return [
+            self._devices[device_id]
+            for device_id in sorted(device_ids, key=self._order.__getitem__)
+        ]
+
     def filter_by(
             self,
             platform: Optional[str] = None,
@@ -163,23 +326,49 @@ class InMemoryDeviceRepository(DeviceRepository):
             site: Optional[str] = None,
     ) -> list[Device]:
         """
-        Filter devices by criteria using list comprehension.
+        Filter devices by criteria using the attribute indexes.
 
         All provided criteria must match (AND logic).
         None values are ignored (wildcard).
-        """
-        results = []
 
-        for device in self._devices.values():
-            # Check each criterion if provided
-            if platform is not None and device.platform.value != platform:
-                continue
-            if role is not None and device.role.value != role:
-                continue
-            if site is not None and device.site != site:
+        Each criterion selects a set of ids from its index and the sets
+        are intersected, smallest first, so only matching devices are
+        visited. Results come back in insertion order, like get_all().
+        """
+        # The platform and role indexes are keyed by enum member, but
+        # DevicePlatform/DeviceRole are str enums: a member hashes and
+        # compares equal to its value, so the raw string finds the same
+        # bucket without converting it. An unknown value simply misses.
+
+        # Look up the id set for every given criterion first
+        buckets: list[set[UUID]] = []
+        for index, value in (
+            (self._by_platform, platform),
+            (self._by_role, role),
+            (self._by_site, site),
+        ):
+            if value is None:
                 continue
-
-            results.append(device)
-
-        return results
-
+            # .get() so that querying an unknown value doesn't add a key
+            matches = index.get(value)
+            if not matches:
+                return []  # No device has this value, so nothing can match
+            buckets.append(matches)
+
+        if not buckets:
+            return self.get_all()
+
+        # A single criterion is the common case: its bucket is the answer
+        if len(buckets) == 1:
+            return self._in_insertion_order(buckets[0])
+
+        # Intersect the most selective (smallest) set first, so every
+        # intermediate result is at most as large as the smallest bucket
+        buckets.sort(key=len)
+        candidates = buckets[0]
+        for matches in buckets[1:]:
+            candidates = candidates & matches
+            if not candidates:
+                return []  # Remaining criteria can't add matches back
+
+        return self._in_insertion_order(candidates)
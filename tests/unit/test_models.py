@@ -8,12 +8,18 @@ These tests verify:
 4. Default values work correctly
 """
 
+import os
+import signal
+import subprocess
+import sys
 from datetime import datetime
-from uuid import UUID
+from pathlib import Path
+from uuid import RFC_4122, UUID
 
 import pytest
 from pydantic import ValidationError
 
+from src.models import device as device_module
 from src.models.device import (
     Device,
     DeviceCreate,
@@ -54,6 +60,41 @@ class TestDevice:
 
         assert isinstance(device.id, UUID)
 
+    def test_generated_ids_are_unique_uuid4(self):
+        """Generated ids should be distinct version 4 UUIDs across pool refills."""
+        ids = [
+            Device(
+                hostname="leaf1",
+                management_ip="10.0.0.2",
+                platform=DevicePlatform.EOS,
+                role=DeviceRole.LEAF,
+                site="dc1",
+            ).id
+            for _ in range(600)
+        ]
+
+        assert len(set(ids)) == len(ids)
+        assert all(i.version == 4 for i in ids)
+        assert all(i.variant == RFC_4122 for i in ids)
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_forked_child_can_generate_ids_while_lock_held(self):
+        """A fork while the id lock is held should not deadlock the child."""
+        with device_module._uuid_lock:
+            pid = os.fork()
+            if pid == 0:
+                # Child: SIGALRM kills it if id generation blocks
+                signal.alarm(5)
+                exit_code = 1
+                try:
+                    device_module._fast_uuid4()
+                    exit_code = 0
+                finally:
+                    os._exit(exit_code)
+        _, status = os.waitpid(pid, 0)
+
+        assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
     def test_auto_generates_timestamps(self):
         """Device should auto-generate created_at and updated_at."""
         before = datetime.now()
@@ -84,6 +125,27 @@ class TestDevice:
         errors = exc_info.value.errors()
         assert any(e["loc"] == ("hostname",) for e in errors)
 
+    def test_strips_whitespace(self):
+        """Device should strip strings, so a blank hostname is rejected."""
+        device = Device(
+            hostname=" spine1 ",
+            management_ip="10.0.0.1",
+            platform=DevicePlatform.EOS,
+            role=DeviceRole.SPINE,
+            site="dc1 ",
+        )
+
+        assert device.hostname == "spine1"
+        assert device.site == "dc1"
+        with pytest.raises(ValidationError):
+            Device(
+                hostname="   ",
+                management_ip="10.0.0.1",
+                platform=DevicePlatform.EOS,
+                role=DeviceRole.SPINE,
+                site="dc1",
+            )
+
     def test_rejects_invalid_ip(self):
         """Device should reject invalid IP addresses."""
         with pytest.raises(ValidationError) as exc_info:
@@ -189,6 +251,24 @@ class TestDeviceUpdate:
             DeviceUpdate(hostname="")  # Empty string should fail
 
 
+class TestPackageExports:
+    """Tests for the lazily resolved src.models exports."""
+
+    def test_import_package_does_not_import_pydantic(self):
+        """Importing src.models alone should not pull in pydantic."""
+        code = "import sys, src.models; print('pydantic' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parents[2],
+        )
 
+        assert result.stdout.strip() == "False"
 
+    def test_exports_resolve_to_model_classes(self):
+        """Names imported from the package should be the real classes."""
+        from src.models import Device as ExportedDevice
 
+        assert ExportedDevice is Device
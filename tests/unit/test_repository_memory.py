@@ -5,13 +5,20 @@ These tests verify all CRUD operations and edge cases.
 We use pytest fixtures to set up clean repository instances.
 """
 
+from datetime import datetime, timezone
+from uuid import UUID
+
 import pytest
-from uuid import uuid4
 
 from src.models.device import DeviceCreate, DevicePlatform, DeviceRole, DeviceUpdate
+from src.repositories.base import DeviceRepository
 from src.repositories.memory import InMemoryDeviceRepository
 from src.repositories.exceptions import DuplicateDeviceError
 
+# An id no repository will hand out in practice: all 122 random bits are
+# zero. Avoids drawing a random UUID per negative test.
+MISSING_ID = UUID("00000000-0000-4000-8000-000000000000")
+
 
 @pytest.fixture
 def repo():
@@ -24,9 +31,14 @@ def repo():
     return InMemoryDeviceRepository()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_device_data():
-    """Reusable device creation data."""
+    """
+    Reusable device creation data.
+
+    Session-scoped: built and validated once, since tests only pass it
+    to the repository and never modify it.
+    """
     return DeviceCreate(
         hostname="spine1",
         management_ip="10.0.0.1",
@@ -36,6 +48,14 @@ def sample_device_data():
     )
 
 
+class TestProtocol:
+    """Tests that the repository satisfies the DeviceRepository interface."""
+
+    def test_implements_device_repository(self, repo):
+        """Every method of the protocol should be implemented."""
+        assert isinstance(repo, DeviceRepository)
+
+
 class TestAdd:
     """Tests for the add operation."""
 
@@ -54,6 +74,22 @@ class TestAdd:
         assert device.created_at is not None
         assert device.updated_at is not None
 
+    def test_add_strips_whitespace(self, repo):
+        """String fields should be stripped before they reach the indexes."""
+        device = repo.add(
+            DeviceCreate(
+                hostname="  spine1 ",
+                management_ip="10.0.0.1",
+                platform=DevicePlatform.EOS,
+                role=DeviceRole.SPINE,
+                site=" dc1",
+            )
+        )
+
+        assert device.hostname == "spine1"
+        assert device.site == "dc1"
+        assert repo.get_by_hostname("spine1") is not None
+
     def test_add_duplicate_hostname_raises(self, repo, sample_device_data):
         """Adding a device with duplicate hostname should raise."""
         repo.add(sample_device_data)
@@ -88,6 +124,88 @@ class TestAdd:
             repo.add(duplicate)
 
         assert exc_info.value.field == "management_ip"
+        assert exc_info.value.value == "10.0.0.1"
+
+    def test_add_ipv4_and_ipv6_with_same_value(self, repo):
+        """0.0.0.1 and ::1 are different addresses, not duplicates."""
+        repo.add(
+            DeviceCreate(
+                hostname="spine1",
+                management_ip="0.0.0.1",
+                platform=DevicePlatform.EOS,
+                role=DeviceRole.SPINE,
+                site="dc1",
+            )
+        )
+
+        device = repo.add(
+            DeviceCreate(
+                hostname="spine2",
+                management_ip="::1",
+                platform=DevicePlatform.EOS,
+                role=DeviceRole.SPINE,
+                site="dc1",
+            )
+        )
+
+        assert str(device.management_ip) == "::1"
+
+
+class TestBulkAdd:
+    """Tests for the bulk_add operation."""
+
+    @staticmethod
+    def _device_data(i: int) -> DeviceCreate:
+        return DeviceCreate(
+            hostname=f"leaf{i}",
+            management_ip=f"10.0.1.{i}",
+            platform=DevicePlatform.EOS,
+            role=DeviceRole.LEAF,
+            site="dc1",
+        )
+
+    def test_bulk_add_returns_devices_in_order(self, repo):
+        """Should return one device per input, in input order."""
+        devices = repo.bulk_add(self._device_data(i) for i in range(1, 4))
+
+        assert [d.hostname for d in devices] == ["leaf1", "leaf2", "leaf3"]
+        assert len({d.id for d in devices}) == 3
+        assert repo.get_by_hostname("leaf2") is devices[1]
+        assert len(repo.filter_by(role="leaf")) == 3
+
+    def test_bulk_add_shares_timestamp(self, repo):
+        """All devices in a batch should get the same timestamps."""
+        devices = repo.bulk_add([self._device_data(1), self._device_data(2)])
+
+        assert devices[0].created_at == devices[1].created_at
+        assert devices[0].created_at == devices[0].updated_at
+
+    def test_bulk_add_duplicate_in_batch_adds_nothing(self, repo):
+        """A duplicate within the batch should raise and store nothing."""
+        batch = [self._device_data(1), self._device_data(2), self._device_data(1)]
+
+        with pytest.raises(DuplicateDeviceError) as exc_info:
+            repo.bulk_add(batch)
+
+        assert exc_info.value.field == "hostname"
+        assert repo.get_all() == []
+
+    def test_bulk_add_duplicate_of_existing_ip_raises(self, repo, sample_device_data):
+        """A duplicate of a stored device's IP should raise."""
+        repo.add(sample_device_data)
+        duplicate = DeviceCreate(
+            hostname="spine2",
+            management_ip="10.0.0.1",
+            platform=DevicePlatform.EOS,
+            role=DeviceRole.SPINE,
+            site="dc1",
+        )
+
+        with pytest.raises(DuplicateDeviceError) as exc_info:
+            repo.bulk_add([self._device_data(1), duplicate])
+
+        assert exc_info.value.field == "management_ip"
+        assert repo.get_by_hostname("leaf1") is None
 
 
 class TestGetById:
@@ -103,9 +221,17 @@ class TestGetById:
         assert retrieved.id == created.id
         assert retrieved.hostname == created.hostname
 
+    def test_returns_stored_instance(self, repo, sample_device_data):
+        """Devices are frozen, so reads return the stored object, not a copy."""
+        created = repo.add(sample_device_data)
+
+        assert repo.get_by_id(created.id) is created
+        assert repo.get_all()[0] is created
+        assert repo.filter_by(site="dc1")[0] is created
+
     def test_get_nonexistent_returns_none(self, repo):
         """Should return None for unknown ID."""
-        result = repo.get_by_id(uuid4())
+        result = repo.get_by_id(MISSING_ID)
 
         assert result is None
 
@@ -122,6 +248,16 @@ class TestGetByHostname:
         assert retrieved is not None
         assert retrieved.id == created.id
 
+    def test_get_by_hostname_after_update(self, repo, sample_device_data):
+        """Should return the updated device, not the stale one."""
+        created = repo.add(sample_device_data)
+        updated = repo.update(created.id, DeviceUpdate(site="dc2"))
+
+        retrieved = repo.get_by_hostname("spine1")
+
+        assert retrieved is updated
+        assert retrieved.site == "dc2"
+
     def test_get_nonexistent_hostname_returns_none(self, repo):
         """Should return None for unknown hostname."""
         result = repo.get_by_hostname("nonexistent")
@@ -160,6 +296,41 @@ class TestGetAll:
         hostnames = {d.hostname for d in result}
         assert hostnames == {"device1", "device2", "device3"}
 
+    def test_modifying_result_leaves_repository_unchanged(self, repo, sample_device_data):
+        """The returned list belongs to the caller."""
+        created = repo.add(sample_device_data)
+
+        repo.get_all().clear()
+
+        assert repo.get_all() == [created]
+
+    def test_mutations_refresh_list(self, repo, sample_device_data):
+        """Add, update and delete should all be reflected by get_all."""
+        created = repo.add(sample_device_data)
+        assert repo.get_all() == [created]
+
+        updated = repo.update(created.id, DeviceUpdate(site="dc2"))
+        assert repo.get_all() == [updated]
+
+        repo.delete(created.id)
+        assert repo.get_all() == []
+
+
+class TestIterAll:
+    """Tests for iter_all operation."""
+
+    def test_empty_repo_yields_nothing(self, repo):
+        """Empty repository should yield no devices."""
+        assert list(repo.iter_all()) == []
+
+    def test_yields_all_devices(self, repo, sample_device_data):
+        """Should yield the stored devices."""
+        created = repo.add(sample_device_data)
+
+        result = list(repo.iter_all())
+
+        assert result == [created]
+
 
 class TestUpdate:
     """Tests for update operation."""
@@ -188,6 +359,46 @@ class TestUpdate:
         assert updated.hostname == "new-spine"
         assert updated.site == "dc2"
 
+    def test_update_leaves_previous_instance_unchanged(self, repo, sample_device_data):
+        """Update should replace the stored device, not mutate the old one."""
+        created = repo.add(sample_device_data)
+
+        updated = repo.update(created.id, DeviceUpdate(site="dc2"))
+
+        assert updated is not created
+        assert created.site == "dc1"
+        assert repo.get_by_id(created.id) is updated
+
+    def test_update_ip_frees_old_address(self, repo, sample_device_data):
+        """Changing the IP should release the old one and claim the new one."""
+        created = repo.add(sample_device_data)
+        repo.update(created.id, DeviceUpdate(management_ip="10.0.0.50"))
+
+        reused = repo.add(
+            DeviceCreate(
+                hostname="spine2",
+                management_ip="10.0.0.1",
+                platform=DevicePlatform.EOS,
+                role=DeviceRole.SPINE,
+                site="dc1",
+            )
+        )
+
+        assert str(reused.management_ip) == "10.0.0.1"
+        with pytest.raises(DuplicateDeviceError):
+            repo.update(reused.id, DeviceUpdate(management_ip="10.0.0.50"))
+
+    def test_update_ignores_explicit_none(self, repo, sample_device_data):
+        """Fields explicitly set to None should be left unchanged."""
+        created = repo.add(sample_device_data)
+
+        update = DeviceUpdate(hostname=None, site="dc2")
+        updated = repo.update(created.id, update)
+
+        assert updated.hostname == "spine1"
+        assert updated.site == "dc2"
+        assert repo.get_by_hostname("spine1") is not None
+
     def test_update_changes_updated_at(self, repo, sample_device_data):
         """Update should change the updated_at timestamp."""
         created = repo.add(sample_device_data)
@@ -198,10 +409,42 @@ class TestUpdate:
 
         assert updated.updated_at > original_updated_at
 
+    def test_empty_update_returns_existing(self, repo, sample_device_data):
+        """An update with no fields set should return the stored device."""
+        created = repo.add(sample_device_data)
+
+        result = repo.update(created.id, DeviceUpdate())
+
+        assert result is created
+
+    def test_update_uses_given_timestamp(self, repo, sample_device_data):
+        """A caller-supplied timestamp should become updated_at."""
+        created = repo.add(sample_device_data)
+        now = datetime(2030, 1, 1, 12, 0)
+
+        updated = repo.update(created.id, DeviceUpdate(site="dc2"), now=now)
+
+        assert updated.updated_at == now
+        assert updated.created_at == created.created_at
+
+    @pytest.mark.parametrize(
+        "now, error",
+        [("yesterday", TypeError), (datetime(2030, 1, 1, tzinfo=timezone.utc), ValueError)],
+        ids=["not-a-datetime", "timezone-aware"],
+    )
+    def test_update_rejects_invalid_timestamp(self, repo, sample_device_data, now, error):
+        """A now that isn't a naive datetime should raise and store nothing."""
+        created = repo.add(sample_device_data)
+
+        with pytest.raises(error):
+            repo.update(created.id, DeviceUpdate(site="dc2"), now=now)
+
+        assert repo.get_by_id(created.id) is created
+
     def test_update_nonexistent_returns_none(self, repo):
         """Updating nonexistent device should return None."""
         update = DeviceUpdate(hostname="new-name")
-        result = repo.update(uuid4(), update)
+        result = repo.update(MISSING_ID, update)
 
         assert result is None
 
@@ -231,6 +474,31 @@ class TestUpdate:
         with pytest.raises(DuplicateDeviceError):
             repo.update(device2.id, update)
 
+    def test_failed_update_leaves_indexes_unchanged(self, repo, sample_device_data):
+        """A rejected update should not claim any of its new values."""
+        other = repo.add(
+            DeviceCreate(
+                hostname="leaf1",
+                management_ip="10.0.0.2",
+                platform=DevicePlatform.NXOS,
+                role=DeviceRole.LEAF,
+                site="dc2",
+            )
+        )
+        created = repo.add(sample_device_data)
+
+        # New hostname is free, but the IP belongs to the other device
+        update = DeviceUpdate(hostname="spine9", management_ip="10.0.0.2", site="dc3")
+        with pytest.raises(DuplicateDeviceError):
+            repo.update(created.id, update)
+
+        assert repo.get_by_id(created.id) is created
+        assert repo.get_by_hostname("spine1") is created
+        assert repo.get_by_hostname("spine9") is None
+        assert repo.filter_by(site="dc3") == []
+        assert repo.filter_by(site="dc1") == [created]
+        assert repo.get_by_hostname("leaf1") is other
+
 
 class TestDelete:
     """Tests for delete operation."""
@@ -246,7 +514,7 @@ class TestDelete:
 
     def test_delete_nonexistent_returns_false(self, repo):
         """Should return False for unknown ID."""
-        result = repo.delete(uuid4())
+        result = repo.delete(MISSING_ID)
 
         assert result is False
 
@@ -263,10 +531,10 @@ class TestDelete:
 class TestFilterBy:
     """Tests for filter_by operation."""
 
-    @pytest.fixture
-    def populated_repo(self, repo):
-        """Repository with multiple devices for filtering tests."""
-        devices = [
+    @pytest.fixture(scope="session")
+    def filter_devices_data(self):
+        """Creation data for the filtering tests, validated once per session."""
+        return [
             DeviceCreate(
                 hostname="spine1",
                 management_ip="10.0.0.1",
@@ -297,47 +565,109 @@ class TestFilterBy:
             ),
         ]
 
-        for device_data in devices:
-            repo.add(device_data)
+    @pytest.fixture
+    def populated_repo(self, repo, filter_devices_data):
+        """Repository with multiple devices for filtering tests."""
+        repo.bulk_add(filter_devices_data)
 
         return repo
 
-    def test_filter_by_platform(self, populated_repo):
-        """Should return only devices matching platform."""
-        results = populated_repo.filter_by(platform="eos")
+    @pytest.fixture(scope="session")
+    def shared_populated_repo(self, filter_devices_data):
+        """
+        Populated repository built once and shared by the read-only tests.
 
-        assert len(results) == 2
-        assert all(d.platform == DevicePlatform.EOS for d in results)
+        A separate instance from the per-test `repo`. Tests using it must
+        not modify it.
+        """
+        repo = InMemoryDeviceRepository()
+        repo.bulk_add(filter_devices_data)
+        return repo
 
-    def test_filter_by_role(self, populated_repo):
-        """Should return only devices matching role."""
-        results = populated_repo.filter_by(role="spine")
+    @pytest.mark.parametrize(
+        "criteria, expected_hostnames",
+        [
+            ({"platform": "eos"}, ["spine1", "spine2"]),
+            ({"role": "spine"}, ["spine1", "spine2"]),
+            ({"site": "dc1"}, ["spine1", "leaf1", "leaf2"]),
+            ({"role": "leaf", "site": "dc1"}, ["leaf1", "leaf2"]),
+            ({"role": DeviceRole.LEAF}, ["leaf1", "leaf2"]),
+            ({"site": "dc99"}, []),
+            ({"platform": "cisco_ios"}, []),
+            ({}, ["spine1", "spine2", "leaf1", "leaf2"]),
+        ],
+        ids=[
+            "platform",
+            "role",
+            "site",
+            "multiple-criteria",
+            "enum-member",
+            "no-matches",
+            "unknown-platform",
+            "no-criteria",
+        ],
+    )
+    def test_filter_by(self, shared_populated_repo, criteria, expected_hostnames):
+        """Should return the devices matching ALL given criteria, in insertion order."""
+        results = shared_populated_repo.filter_by(**criteria)
 
-        assert len(results) == 2
-        assert all(d.role == DeviceRole.SPINE for d in results)
+        assert [d.hostname for d in results] == expected_hostnames
 
-    def test_filter_by_site(self, populated_repo):
-        """Should return only devices matching site."""
-        results = populated_repo.filter_by(site="dc1")
+    def test_filter_accepts_str_subclass(self, shared_populated_repo):
+        """A str subclass criterion should match like the plain string."""
+
+        class SiteStr(str):
+            pass
 
-        assert len(results) == 3
-        assert all(d.site == "dc1" for d in results)
+        results = shared_populated_repo.filter_by(site=SiteStr("dc2"))
 
-    def test_filter_by_multiple_criteria(self, populated_repo):
-        """Should return devices matching ALL criteria."""
-        results = populated_repo.filter_by(role="leaf", site="dc1")
+        assert [d.hostname for d in results] == ["spine2"]
 
-        assert len(results) == 2
-        assert all(d.role == DeviceRole.LEAF and d.site == "dc1" for d in results)
+    def test_filter_reflects_update(self, populated_repo):
+        """Should index devices under their updated values."""
+        spine2 = populated_repo.get_by_hostname("spine2")
+        populated_repo.update(spine2.id, DeviceUpdate(site="dc1"))
 
-    def test_filter_no_matches_returns_empty(self, populated_repo):
-        """Should return empty list when no matches."""
-        results = populated_repo.filter_by(site="dc99")
+        results = populated_repo.filter_by(site="dc1")
 
-        assert results == []
+        # spine2 keeps its original position rather than moving to the end
+        assert [d.hostname for d in results] == ["spine1", "spine2", "leaf1", "leaf2"]
+        assert populated_repo.filter_by(site="dc2") == []
 
-    def test_filter_no_criteria_returns_all(self, populated_repo):
-        """Should return all devices when no criteria provided."""
-        results = populated_repo.filter_by()
+    def test_filter_excludes_deleted(self, populated_repo):
+        """Should drop deleted devices from the indexes."""
+        spine1 = populated_repo.get_by_hostname("spine1")
+        populated_repo.delete(spine1.id)
+
+        results = populated_repo.filter_by(platform="eos")
+
+        assert [d.hostname for d in results] == ["spine2"]
+
+    def test_emptied_buckets_are_removed(self, populated_repo):
+        """Update and delete should drop an attribute bucket once it is empty."""
+        # Looks inside the repository on purpose: an empty bucket is
+        # invisible through filter_by, which returns [] either way
+        spine2 = populated_repo.get_by_hostname("spine2")
+        populated_repo.update(spine2.id, DeviceUpdate(site="dc1"))
+        leaf2 = populated_repo.get_by_hostname("leaf2")
+        populated_repo.delete(leaf2.id)
+
+        assert "dc2" not in populated_repo._by_site
+        assert DevicePlatform.IOS_XE not in populated_repo._by_platform
+
+    def test_filter_orders_small_match_by_insertion(self, populated_repo):
+        """A match much smaller than the store should still keep insertion order."""
+        for i in range(5, 10):
+            populated_repo.add(
+                DeviceCreate(
+                    hostname=f"leaf{i}",
+                    management_ip=f"10.0.0.{i}",
+                    platform=DevicePlatform.JUNOS,
+                    role=DeviceRole.LEAF,
+                    site="dc3",
+                )
+            )
+
+        results = populated_repo.filter_by(role="spine")
 
-        assert len(results) == 4
\ No newline at end of file
+        assert [d.hostname for d in results] == ["spine1", "spine2"]